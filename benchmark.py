@@ -0,0 +1,81 @@
+import argparse
+import random
+import time
+
+from graphs.digraph import Digraph
+from graphs.diameter import estimate_diameter, find_diameter
+from graphs.vertex import Vertex
+
+
+def generate_npm_graph(nodes: int, max_dependencies: int, seed: int) -> Digraph:
+    """
+        Generate a dependency graph where every package depends on a few of
+        the packages generated before it, like a flattened node_modules folder.
+
+        Args:
+        * nodes - The amount of packages to generate
+        * max_dependencies - The most dependencies a single package can have
+        * seed - The seed for the random dependencies
+
+        Returns:
+        The generated digraph, with edges from dependency to dependant.
+    """
+    rng = random.Random(seed)
+    graph = Digraph()
+
+    for key in range(nodes):
+        graph.add_vertex(Vertex(f"package-{key}"))
+
+    for key in range(1, nodes):
+        for _ in range(rng.randint(1, max_dependencies)):
+            dependency = rng.randrange(key)
+            graph.add_edge(f"package-{dependency}", f"package-{key}")
+
+    return graph
+
+
+def process_args():
+    """
+        Process the arguments for the benchmark
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the diameter computation on a generated dependency graph"
+    )
+    parser.add_argument("--nodes", help="The amount of packages", type=int, default=100000)
+    parser.add_argument(
+        "--dependencies", help="The most dependencies per package", type=int, default=3
+    )
+    parser.add_argument("--processes", help="The amount of search processes", type=int)
+    parser.add_argument("--samples", help="The amount of sampled searches", type=int, default=32)
+    parser.add_argument("--seed", help="The random seed", type=int, default=0)
+
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    """
+        Time the exact and estimated diameter of a generated graph.
+
+        Args:
+        * args - The parsed argument namespace from argparse
+    """
+    start = time.perf_counter()
+    graph = generate_npm_graph(args.nodes, args.dependencies, args.seed)
+    print(f"Generated {graph} in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    lower, upper = estimate_diameter(
+        graph, samples=args.samples, processes=args.processes, seed=args.seed
+    )
+    print(f"Estimated diameter between {lower} and {upper} in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    path, diameter = find_diameter(graph, processes=args.processes)
+    print(f"Exact diameter of {diameter} in {time.perf_counter() - start:.2f}s")
+    print(f"\tFrom {path[0]} to {path[-1]}")
+
+
+if __name__ == "__main__":
+    ARGS = process_args()
+    main(ARGS)
@@ -0,0 +1,364 @@
+"""
+    Module that implements batch analytics over a whole graph by exporting it
+    to a scipy sparse matrix and scoring every vertex with vectorized numpy
+    operations instead of per vertex traversals.
+
+    Edges in the npm graph point from a dependency to its dependant, so the
+    vertices reachable from a package are the packages that depend on it.
+"""
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from graphs.graph import Graph
+
+# Largest V * (V + E) of the condensed graph counted exactly by default
+_EXACT_WORK_LIMIT = 1 << 31
+
+
+def _ranked(keys: [str], scores: np.ndarray, top: int = None) -> [tuple]:
+    """
+        Pair the vertex keys with their scores, highest score first
+    """
+    order = np.argsort(-scores, kind="stable")
+    if top is not None:
+        order = order[:top]
+
+    return [(keys[index], scores[index].item()) for index in order]
+
+
+def to_sparse_matrix(graph: Graph) -> (csr_matrix, [str]):
+    """
+        Export the graph to a sparse adjacency matrix, where the entry at
+        (i, j) is the weight of the edge from vertex i to vertex j.
+
+        Args:
+        * graph - The graph, digraph or subgraph view to export
+
+        Returns:
+        The adjacency matrix and the vertex keys in row order.
+    """
+    keys = list(graph.vertex_keys)
+    index = {key: position for position, key in enumerate(keys)}
+
+    rows, cols, weights = [], [], []
+    for _, from_vert, to_vert, weight in graph.iter_edges():
+        rows.append(index[from_vert])
+        cols.append(index[to_vert])
+        weights.append(weight)
+
+    rows = np.array(rows, dtype=np.int64)
+    cols = np.array(cols, dtype=np.int64)
+    weights = np.array(weights, dtype=np.float64)
+
+    # Undirected edges are only stored once, so mirror them
+    if not graph.is_directed:
+        rows, cols = np.concatenate((rows, cols)), np.concatenate((cols, rows))
+        weights = np.concatenate((weights, weights))
+
+    matrix = csr_matrix((weights, (rows, cols)), shape=(len(keys), len(keys)))
+    return matrix, keys
+
+
+def _condense(matrix: csr_matrix) -> (csr_matrix, np.ndarray, np.ndarray):
+    """
+        Collapse every strongly connected component of the matrix into a single
+        vertex, which turns any graph into a directed acyclic graph.
+
+        Returns:
+        The 0/1 adjacency matrix of the components, the component label of
+        every vertex and the amount of vertices in each component.
+    """
+    count, labels = connected_components(matrix, directed=True, connection="strong")
+    coo = matrix.tocoo()
+    from_comp, to_comp = labels[coo.row], labels[coo.col]
+
+    # Drop the edges inside of a component, they'd be self loops
+    keep = from_comp != to_comp
+    condensed = csr_matrix(
+        (np.ones(keep.sum(), dtype=np.float64), (from_comp[keep], to_comp[keep])),
+        shape=(count, count),
+    )
+    condensed.sum_duplicates()
+    condensed.data[:] = 1.0
+
+    return condensed, labels, np.bincount(labels, minlength=count)
+
+
+def _topological_levels(dag: csr_matrix) -> [np.ndarray]:
+    """
+        Group the vertices of a directed acyclic graph by their height, i.e. the
+        longest amount of edges to a vertex without any out edges. Every edge
+        goes from a higher level to a lower one.
+
+        Returns:
+        A list of vertex index arrays, starting with the sinks.
+    """
+    size = dag.shape[0]
+    predecessors = dag.T.tocsr()
+    remaining = np.diff(dag.indptr)
+    frontier = np.flatnonzero(remaining == 0)
+    levels = []
+
+    # Peel off the vertices whose children have all been placed
+    while frontier.size:
+        levels.append(frontier)
+        preds = predecessors[frontier].indices
+        remaining = remaining - np.bincount(preds, minlength=size)
+        frontier = np.unique(preds[remaining[preds] == 0])
+
+    return levels
+
+
+def _level_children(
+    dag: csr_matrix, levels: [np.ndarray], max_edges: int = 1 << 18
+) -> [tuple]:
+    """
+        Slice the children of every level out of the matrix once, so passes
+        over the levels don't have to slice it again. Vertices without children
+        are skipped, and big levels are split so no piece has more than
+        max_edges children, which caps the memory of gathering them.
+
+        Returns:
+        A list of (vertex indices, child indices, start of each vertex's
+        children) tuples, in the same order as the levels.
+    """
+    sliced = []
+    for nodes in levels:
+        children = dag[nodes]
+        counts = np.diff(children.indptr)
+        has_children = counts > 0
+        nodes, counts = nodes[has_children], counts[has_children]
+        ends = np.cumsum(counts)
+
+        first = 0
+        while first < nodes.size:
+            first_edge = ends[first] - counts[first]
+            last = int(np.searchsorted(ends, first_edge + max_edges, side="right"))
+            last = max(first + 1, last)
+            piece_counts = counts[first:last]
+            starts = np.concatenate(([0], np.cumsum(piece_counts)[:-1]))
+            sliced.append(
+                (nodes[first:last], children.indices[first_edge:ends[last - 1]], starts)
+            )
+            first = last
+
+    return sliced
+
+
+def pagerank(
+    graph: Graph, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100, top: int = None
+) -> [tuple]:
+    """
+        Rank the packages using PageRank: https://en.wikipedia.org/wiki/PageRank
+        Every dependant passes its rank to the packages it depends on, so
+        packages that are depended on by important packages score higher.
+
+        Args:
+        * graph - The graph to rank
+        * damping - (0.85) - The probability of following a dependency
+        * tol - (1e-10) - Stop once the total change of the ranks is below this
+        * max_iter - (100) - The maximum amount of power iterations
+        * top - (None) - Only return the highest ranked packages
+
+        Returns:
+        A list of (vertex key, rank) tuples, highest rank first.
+    """
+    matrix, keys = to_sparse_matrix(graph)
+    size = len(keys)
+    if not size:
+        return []
+
+    # Normalize every column by the amount of dependencies of that dependant
+    matrix.data[:] = 1.0
+    dependencies = np.asarray(matrix.sum(axis=0)).ravel()
+    dangling = dependencies == 0
+    transition = matrix.multiply(1.0 / np.where(dangling, 1.0, dependencies)).tocsr()
+
+    ranks = np.full(size, 1.0 / size)
+    for _ in range(max_iter):
+        # Packages without dependencies spread their rank over everything
+        new_ranks = damping * (transition @ ranks + ranks[dangling].sum() / size)
+        new_ranks += (1.0 - damping) / size
+
+        converged = np.abs(new_ranks - ranks).sum() < tol
+        ranks = new_ranks
+        if converged:
+            break
+
+    return _ranked(keys, ranks, top)
+
+
+def _exact_reach_sizes(
+    level_children: [tuple], sizes: np.ndarray, block_bits: int = 4096
+) -> np.ndarray:
+    """
+        Count the packages every component can reach by propagating packed
+        bitsets one level at a time, for block_bits target components at once.
+        The work is O(V * E / 64) word operations, so keep it for small graphs.
+
+        Returns:
+        The amount of packages every component can reach, itself included.
+    """
+    count = sizes.size
+    totals = np.zeros(count, dtype=np.int64)
+
+    # Rows per unpacking slab, keeping the unpacked bits around 16MB
+    words = -(-block_bits // 64)
+    slab = max(1, (1 << 24) // (words * 64))
+
+    for start in range(0, count, words * 64):
+        stop = min(start + words * 64, count)
+        offsets = np.arange(stop - start)
+
+        # Every component can reach itself
+        reach = np.zeros((count, words), dtype="<u8")
+        reach[start + offsets, offsets // 64] = np.left_shift(
+            np.uint64(1), (offsets % 64).astype(np.uint64)
+        )
+
+        # Children always sit in a lower level, so their bits are final
+        for nodes, indices, starts in level_children:
+            reach[nodes] |= np.bitwise_or.reduceat(reach[indices], starts, axis=0)
+
+        # Weight every reached component by the amount of packages inside of it
+        block_sizes = sizes[start:stop]
+        for row in range(0, count, slab):
+            bits = np.unpackbits(
+                reach[row:row + slab].view(np.uint8), axis=1, bitorder="little"
+            )[:, :stop - start]
+            totals[row:row + slab] += bits @ block_sizes
+
+    return totals
+
+
+def _estimated_reach_sizes(
+    level_children: [tuple], sizes: np.ndarray, sketch_size: int = 64, seed: int = None
+) -> np.ndarray:
+    """
+        Estimate the packages every component can reach with min sketches:
+        https://doi.org/10.1016/S0022-0000(97)91515-X
+        Every component draws sketch_size exponential variables with a rate of
+        its size. The minimum over a set of components is exponential with the
+        total size of the set as its rate, so the minimums merged level by level
+        estimate every reach in O(E * sketch_size) with a relative error around
+        1 / sqrt(sketch_size).
+
+        Returns:
+        The estimated amount of packages every component can reach, itself included.
+    """
+    rng = np.random.default_rng(seed)
+    sketches = rng.standard_exponential((sizes.size, sketch_size), dtype=np.float32)
+    sketches /= sizes[:, None].astype(np.float32)
+
+    # Children always sit in a lower level, so their minimums are final
+    for nodes, indices, starts in level_children:
+        sketches[nodes] = np.minimum(
+            sketches[nodes], np.minimum.reduceat(sketches[indices], starts, axis=0)
+        )
+
+    return (sketch_size - 1) / sketches.sum(axis=1, dtype=np.float64)
+
+
+def transitive_dependants(
+    graph: Graph,
+    exact: bool = None,
+    sketch_size: int = 64,
+    seed: int = None,
+    top: int = None,
+) -> [tuple]:
+    """
+        Count how many packages depend on each package, directly or through
+        other packages. Small graphs are counted exactly with bitsets and big
+        ones are estimated with min sketches, both propagated over the condensed
+        graph one level at a time with no per vertex Python loops.
+
+        Args:
+        * graph - The graph to count the dependants in
+        * exact - (None) - Force the exact (True) or estimated (False) counts,
+        by default only graphs with up to about 46k condensed packages are exact
+        * sketch_size - (64) - The amount of minimums kept per package when estimating
+        * seed - (None) - The seed for the estimate's random variables
+        * top - (None) - Only return the packages with the most dependants
+
+        Returns:
+        A list of (vertex key, dependant count) tuples, highest count first.
+    """
+    matrix, keys = to_sparse_matrix(graph)
+    if not keys:
+        return []
+
+    dag, labels, sizes = _condense(matrix)
+    level_children = _level_children(dag, _topological_levels(dag))
+
+    # The exact bitsets take O(V * (V + E) / 64) work and O(V) words per vertex
+    if exact is None:
+        count = dag.shape[0]
+        exact = count * (count + dag.nnz) <= _EXACT_WORK_LIMIT
+
+    if exact:
+        totals = _exact_reach_sizes(level_children, sizes)
+    else:
+        totals = np.rint(_estimated_reach_sizes(level_children, sizes, sketch_size, seed))
+
+        # A component reaches at least itself and at most every package
+        totals = np.clip(totals, sizes, sizes.sum()).astype(np.int64)
+
+    # A package isn't its own dependant
+    return _ranked(keys, totals[labels] - 1, top)
+
+
+def _log_chains(level_children: [tuple], count: int) -> np.ndarray:
+    """
+        Count the chains starting at every vertex in log space, so long chains
+        of dependencies can't overflow.
+
+        Returns:
+        The log of the amount of chains starting at every vertex, itself included.
+    """
+    # A vertex without children only starts the chain of itself, log(1) = 0
+    log_chains = np.zeros(count)
+
+    for nodes, indices, starts in level_children:
+        values = log_chains[indices]
+        peaks = np.maximum.reduceat(values, starts)
+        segments = np.repeat(np.arange(starts.size), np.diff(np.append(starts, values.size)))
+        sums = np.add.reduceat(np.exp(values - peaks[segments]), starts)
+        log_chains[nodes] = np.logaddexp(0.0, peaks + np.log(sums))
+
+    return log_chains
+
+
+def path_criticality(graph: Graph, top: int = None) -> [tuple]:
+    """
+        Score each package by the share of all dependency chains that pass
+        through it, a betweenness style measure. The chain counts grow
+        exponentially with the depth of the graph, so they're kept in log space
+        and only the share is returned. Packages in a dependency cycle share the
+        score of their whole cycle.
+
+        Args:
+        * graph - The graph to score
+        * top - (None) - Only return the most critical packages
+
+        Returns:
+        A list of (vertex key, share of chains) tuples, highest share first.
+    """
+    matrix, keys = to_sparse_matrix(graph)
+    if not keys:
+        return []
+
+    dag, labels, _ = _condense(matrix)
+    levels = _topological_levels(dag)
+    count = dag.shape[0]
+
+    # Chains starting at each component from the sinks upwards, and chains
+    # ending at each component from the sources downwards
+    log_out = _log_chains(_level_children(dag, levels), count)
+    log_in = _log_chains(_level_children(dag.T.tocsr(), levels[::-1]), count)
+
+    # Every chain starts at exactly one component
+    peak = log_out.max()
+    log_total = peak + np.log(np.exp(log_out - peak).sum())
+
+    return _ranked(keys, np.exp(log_in + log_out - log_total)[labels], top)
@@ -0,0 +1,393 @@
+"""
+    Module that implements exact and estimated diameter computation for large
+    graphs. Distances ignore the direction of the edges, so for the npm graph
+    this is the undirected diameter: two packages can be far apart through a
+    shared dependant or dependency without either one depending on the other,
+    so it is not the length of a dependency chain.
+
+    The exact diameter uses a double sweep followed by iFUB pruning:
+    https://doi.org/10.1016/j.tcs.2012.09.018
+    combined with per vertex eccentricity bounds, which usually needs a small
+    fraction of the breadth first searches of checking every vertex.
+    Independent searches are spread over a process pool that shares one
+    compact sparse copy of the graph.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, shortest_path
+
+from graphs.analytics import to_sparse_matrix
+from graphs.graph import Graph
+
+# The compact graph every worker process runs its searches on
+_SHARED_MATRIX = None
+
+
+def _init_worker(matrix: csr_matrix):
+    """
+        Store the compact graph once per worker instead of once per task
+    """
+    global _SHARED_MATRIX
+    _SHARED_MATRIX = matrix
+
+
+def _sweep_distances(sources: np.ndarray, matrix: csr_matrix = None) -> np.ndarray:
+    """
+        Run a breadth first search from every source vertex
+
+        Returns:
+        A row of distances for every source, with -1 for unreachable vertices.
+    """
+    if matrix is None:
+        matrix = _SHARED_MATRIX
+
+    distances = np.atleast_2d(
+        shortest_path(matrix, directed=True, unweighted=True, indices=sources)
+    )
+    distances[np.isinf(distances)] = -1
+
+    return distances.astype(np.int64)
+
+
+def _sweep_eccentricities(
+    sources: np.ndarray, matrix: csr_matrix = None
+) -> (np.ndarray, np.ndarray):
+    """
+        Run a breadth first search from every source vertex
+
+        Returns:
+        The eccentricity of every source within its component and the index of
+        the vertex farthest away from it.
+    """
+    distances = _sweep_distances(sources, matrix)
+    farthest = distances.argmax(axis=1)
+
+    return distances[np.arange(len(sources)), farthest], farthest
+
+
+class _SweepRunner:
+    """
+        Runs batches of breadth first searches over the compact graph, in a
+        process pool when more than one process is requested and the graph
+        is big enough for the searches to outweigh starting the workers.
+    """
+
+    def __init__(
+        self,
+        matrix: csr_matrix,
+        processes: int = None,
+        chunk_size: int = 16,
+        min_pool_vertices: int = 10000,
+    ):
+        self.matrix = matrix
+        self.processes = processes or os.cpu_count() or 1
+        if matrix.shape[0] < min_pool_vertices:
+            self.processes = 1
+        self.chunk_size = chunk_size
+        self.pool = None
+
+    def __enter__(self):
+        if self.processes > 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.processes, initializer=_init_worker, initargs=(self.matrix,)
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def _run(self, sweep, sources: np.ndarray) -> list:
+        """
+            Split the sources into chunks and run the sweep over every chunk
+        """
+        chunk_size = self.chunk_size
+        if self.pool is not None:
+            # Spread small batches over every process
+            chunk_size = max(1, min(chunk_size, -(-sources.size // self.processes)))
+
+        chunks = [
+            sources[start:start + chunk_size]
+            for start in range(0, sources.size, chunk_size)
+        ]
+
+        # Single searches aren't worth shipping to another process
+        if self.pool is None or len(chunks) == 1:
+            return [sweep(chunk, self.matrix) for chunk in chunks]
+
+        return list(self.pool.map(sweep, chunks))
+
+    def distances(self, sources) -> np.ndarray:
+        """
+            Function for getting the distances from every source to every vertex
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        return np.concatenate(self._run(_sweep_distances, sources))
+
+    def eccentricities(self, sources) -> (np.ndarray, np.ndarray):
+        """
+            Function for getting the eccentricity and farthest vertex of every source
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        if not sources.size:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        results = self._run(_sweep_eccentricities, sources)
+        return (
+            np.concatenate([eccs for eccs, _ in results]),
+            np.concatenate([farthest for _, farthest in results]),
+        )
+
+
+def _compact_graph(graph: Graph) -> (csr_matrix, [str]):
+    """
+        Export the graph to a symmetric 0/1 sparse matrix for the searches
+    """
+    matrix, keys = to_sparse_matrix(graph)
+    matrix = (matrix + matrix.T).tocsr()
+    matrix.data[:] = 1.0
+
+    return matrix, keys
+
+
+def _distances(matrix: csr_matrix, source: int, predecessors: bool = False):
+    """
+        Run a single breadth first search from the source vertex
+    """
+    return shortest_path(
+        matrix,
+        directed=True,
+        unweighted=True,
+        indices=source,
+        return_predecessors=predecessors,
+    )
+
+
+class _EccentricityBounds:
+    """
+        Lower and upper bounds on the eccentricity of every vertex, tightened
+        by every breadth first search: https://doi.org/10.1007/978-3-642-21527-8_8
+
+        Properties:
+        * lower - The lower bound of every eccentricity
+        * upper - The upper bound of every eccentricity
+        * candidates - The vertices that could still change the diameter bounds
+        * best - The largest eccentricity found so far, a lower bound of the diameter
+        * endpoints - The source and farthest vertex of the best eccentricity
+    """
+
+    def __init__(self, labels: np.ndarray):
+        # A component can't be wider than a path through all of its vertices
+        self.lower = np.zeros(labels.size, dtype=np.int64)
+        self.upper = np.bincount(labels)[labels] - 1
+        self.candidates = np.ones(labels.size, dtype=bool)
+        self.best = 0
+        self.endpoints = (0, 0)
+
+    def update(self, sources: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        """
+            Function for tightening the bounds with the searches from the sources
+
+            Returns:
+            * The index of the vertex farthest away from every source
+        """
+        farthest = distances.argmax(axis=1)
+
+        for source, row, far in zip(sources, distances, farthest):
+            ecc = row[far]
+            reached = row >= 0
+            reached_row = row[reached]
+
+            # Triangle inequality through the source
+            self.lower[reached] = np.maximum(
+                self.lower[reached], np.maximum(reached_row, ecc - reached_row)
+            )
+            self.upper[reached] = np.minimum(self.upper[reached], ecc + reached_row)
+            self.lower[source] = self.upper[source] = ecc
+            self.candidates[source] = False
+
+            if ecc > self.best:
+                self.best, self.endpoints = int(ecc), (source, far)
+
+        return farthest
+
+    def prune(self, upper_bound: int):
+        """
+            Function for dropping the vertices that can neither raise the lower
+            bound of the diameter nor help lower its upper bound.
+        """
+        self.candidates &= ~(
+            (self.upper <= self.best) & (2 * self.lower >= upper_bound)
+        )
+
+
+def find_diameter(graph: Graph, processes: int = None) -> ([object], int):
+    """
+        Find the exact diameter of the graph, the longest shortest path between
+        any two vertices in the same connected component, ignoring the direction
+        of the edges.
+
+        Args:
+        * graph - The graph, digraph or subgraph view to measure
+        * processes - (None) - The amount of processes to search with, defaults
+        to the amount of cpus
+
+        Returns:
+        * A list of the vertices along a diameter path and its amount of edges
+        * An empty list and -1 if the graph has no vertices
+    """
+    matrix, keys = _compact_graph(graph)
+    if not keys:
+        return [], -1
+
+    _, labels = connected_components(matrix, directed=False)
+    bounds = _EccentricityBounds(labels)
+
+    with _SweepRunner(matrix, processes) as runner:
+        # Double sweep: the farthest vertex from the farthest vertex is a good guess
+        start = np.diff(matrix.indptr).argmax()
+        first = bounds.update([start], runner.distances([start]))[0]
+        distances, preds = _distances(matrix, first, predecessors=True)
+        distances[np.isinf(distances)] = -1
+        second = bounds.update([first], np.atleast_2d(distances).astype(np.int64))[0]
+
+        # The middle of that path is close to the center of the graph
+        path = [second]
+        while preds[path[-1]] >= 0:
+            path.append(preds[path[-1]])
+        center = path[len(path) // 2]
+
+        levels = runner.distances([center])
+        bounds.update([center], levels)
+        levels = levels[0]
+        top_level = levels.max()
+
+        # Other components always sit past the last level of the center
+        levels[levels < 0] = top_level + 1
+        pick_highest = True
+
+        while True:
+            live = bounds.candidates & (bounds.upper > bounds.best)
+            if not live.any():
+                break
+
+            # iFUB: vertices within L levels of the center are at most 2L apart,
+            # so only the vertices past level L can push the diameter above 2L
+            level_upper = np.zeros(top_level + 2, dtype=np.int64)
+            np.maximum.at(level_upper, levels[live], bounds.upper[live])
+            past_level = np.maximum.accumulate(level_upper[::-1])[::-1][1:]
+            upper_bound = max(
+                bounds.best, int(np.maximum(2 * np.arange(top_level + 1), past_level).min())
+            )
+            if upper_bound <= bounds.best:
+                break
+
+            bounds.prune(upper_bound)
+
+            # Alternate between the vertices that could be the farthest out and
+            # the most central ones, which tighten everyone's upper bound
+            batch = runner.processes
+            highest = (batch + pick_highest) // 2
+            pick_highest = not pick_highest
+
+            live_verts = np.flatnonzero(live)
+            sources = live_verts[:0]
+            highest = min(highest, live_verts.size)
+            if highest:
+                priority = bounds.upper[live_verts] * (top_level + 2) + levels[live_verts]
+                order = np.argpartition(-priority, highest - 1)[:highest]
+                sources = live_verts[order]
+
+            remaining = bounds.candidates.copy()
+            remaining[sources] = False
+            remaining_verts = np.flatnonzero(remaining)
+            lowest = min(batch - sources.size, remaining_verts.size)
+            if lowest:
+                order = np.argpartition(bounds.lower[remaining_verts], lowest - 1)[:lowest]
+                sources = np.concatenate((sources, remaining_verts[order]))
+
+            bounds.update(sources, runner.distances(sources))
+
+    # Rebuild the path between the two endpoints
+    first, second = bounds.endpoints
+    _, preds = _distances(matrix, first, predecessors=True)
+    path = [second]
+    while preds[path[-1]] >= 0:
+        path.append(preds[path[-1]])
+
+    return [graph.graph[keys[index]] for index in reversed(path)], bounds.best
+
+
+def find_eccentricities(graph: Graph, vert_keys=None, processes: int = None) -> dict:
+    """
+        Find the eccentricity of vertices, the amount of edges to the vertex
+        farthest away from them within their connected component.
+
+        Args:
+        * graph - The graph, digraph or subgraph view to measure
+        * vert_keys - (None) - The vertex keys to measure, defaults to every vertex
+        * processes - (None) - The amount of processes to search with, defaults
+        to the amount of cpus
+
+        Returns:
+        A dictionary of vertex key to (eccentricity, farthest vertex key).
+    """
+    matrix, keys = _compact_graph(graph)
+    index = {key: position for position, key in enumerate(keys)}
+
+    if vert_keys is None:
+        vert_keys = keys
+
+    sources = []
+    for vert_key in vert_keys:
+        if vert_key not in index:
+            raise KeyError("The vertex is not stored within this graph.")
+        sources.append(index[vert_key])
+
+    with _SweepRunner(matrix, processes) as runner:
+        eccs, farthest = runner.eccentricities(sources)
+
+    return {
+        keys[source]: (int(ecc), keys[far])
+        for source, ecc, far in zip(sources, eccs, farthest)
+    }
+
+
+def estimate_diameter(
+    graph: Graph, samples: int = 32, processes: int = None, seed: int = None
+) -> (int, int):
+    """
+        Bound the diameter of the graph from a random sample of breadth first
+        searches. Every sampled vertex s gives ecc(s) <= diameter, and the
+        diameter of its component is at most 2 * ecc(s).
+
+        Args:
+        * graph - The graph, digraph or subgraph view to measure
+        * samples - (32) - The amount of vertices to search from
+        * processes - (None) - The amount of processes to search with, defaults
+        to the amount of cpus
+        * seed - (None) - The seed for picking the sampled vertices
+
+        Returns:
+        A tuple of the lower and upper bound of the diameter, or (-1, -1) if
+        the graph has no vertices.
+    """
+    matrix, keys = _compact_graph(graph)
+    if not keys:
+        return -1, -1
+
+    rng = np.random.default_rng(seed)
+    sources = rng.choice(len(keys), size=min(samples, len(keys)), replace=False)
+
+    with _SweepRunner(matrix, processes) as runner:
+        eccs, _ = runner.eccentricities(sources)
+
+    # Unsampled components can be at most a path through all of their vertices
+    count, labels = connected_components(matrix, directed=False)
+    upper_bounds = np.bincount(labels, minlength=count) - 1
+    np.minimum.at(upper_bounds, labels[sources], 2 * eccs)
+
+    return int(eccs.max()), int(upper_bounds.max())
@@ -15,6 +15,13 @@ class Digraph(Graph):
     def __repr__(self):
         return f"<Digraph> - {self.verticies} verts - {self.edges} edges"
 
+    @property
+    def is_directed(self) -> bool:
+        """
+            Whether the edges of the graph only go one way
+        """
+        return True
+
     def add_edge(self, from_vert: str, to_vert: str, weight: float = 1.0):
         """
            Function for adding an edge to the digraph
@@ -39,23 +46,4 @@ class Digraph(Graph):
         # Add the neighbors to the vertex
         added_from = from_vert_obj.add_neighbor((to_vert_obj, weight))
         if added_from:
-            self.edges += 1
-
-    def get_edges(self) -> [tuple]:
-        """
-            Function for getting all of the edges from the graph
-
-            Returns:
-            * A list of the unique edges within the graph.
-        """
-        unique_edges: set = set()
-
-        # Iterate through all of the edges within the graph
-        for vert_key, vert in self.graph.items():
-
-            # Iterate through all of the neighbors of the current vertex
-            for neighbor_vert, weight in vert.neighbors:
-                edge = (vert.key, neighbor_vert.key, int(weight))
-                unique_edges.add(edge)
-
-        return list(unique_edges)
+            self._record_edge(from_vert, to_vert, weight)
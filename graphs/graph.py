@@ -1,9 +1,11 @@
 """
     Module that implements an undirected graph class
 """
+from array import array
 from collections import defaultdict, deque
 from queue import PriorityQueue
 
+from graphs.utils.query_cache import QueryCache, cached_query
 from graphs.vertex import Vertex
 
 
@@ -14,12 +16,31 @@ class Graph:
 
     def __init__(self):
         self.graph = {}
+        self.vertex_keys = []
+        # The index of every vertex key in vertex_keys
+        self.vertex_ids = {}
+        # Edges stored as vertex ids, an edge's id is its index in these buffers
+        self.edge_from = array("i")
+        self.edge_to = array("i")
+        self.edge_weights = array("d")
         self.verticies = 0
         self.edges = 0
+        # Bumped on every mutation so cached query results are never stale
+        self.version = 0
+        self.query_cache = QueryCache()
+        self.__predecessors = None
+        self.__predecessors_version = None
 
     def __repr__(self):
         return f"<Graph> - {self.verticies} verts - {self.edges} edges"
 
+    @property
+    def is_directed(self) -> bool:
+        """
+            Whether the edges of the graph only go one way
+        """
+        return False
+
     def add_vertex(self, vert: Vertex):
         """
             Function for adding a vertex to the graph
@@ -30,7 +51,10 @@ class Graph:
 
         if vert.key not in self.graph:
             self.graph[vert.key] = vert
+            self.vertex_ids[vert.key] = len(self.vertex_keys)
+            self.vertex_keys.append(vert.key)
             self.verticies += 1
+            self.version += 1
             return
 
         raise KeyError("The Vertex you're trying to add already exists")
@@ -60,6 +84,20 @@ class Graph:
         """
         return list(self.graph.values())
 
+    def _vertex_neighbors(self, vert: Vertex) -> [tuple]:
+        """
+            Function for getting the (neighbor, weight) pairs of a vertex
+            object. Every traversal goes through here so that subgraph views
+            can restrict the neighbors without copying the adjacency lists.
+
+            Args:
+            * vert - The vertex object we're getting the neighbors of.
+
+            Returns:
+            * A list of (vertex, weight) tuples
+        """
+        return vert.neighbors
+
     def add_edge(self, from_vert: str, to_vert: str, weight: float = 1.0):
         """
            Function for adding an edge to the graph
@@ -87,7 +125,22 @@ class Graph:
 
         # Ensure that we had successful adds
         if added_from and added_to:
-            self.edges += 1
+            self._record_edge(from_vert, to_vert, weight)
+
+    def _record_edge(self, from_vert: str, to_vert: str, weight: float):
+        """
+            Function for storing a newly added edge, which gets the next edge id.
+
+            Args:
+            * from_vert - The key of the vertex the edge starts at
+            * to_vert - The key of the vertex the edge ends at
+            * weight - The weight of the edge
+        """
+        self.edge_from.append(self.vertex_ids[from_vert])
+        self.edge_to.append(self.vertex_ids[to_vert])
+        self.edge_weights.append(weight)
+        self.edges += 1
+        self.version += 1
 
     def get_neighbors(self, vert_key: str):
         """
@@ -103,34 +156,98 @@ class Graph:
         if vert_key not in self.graph:
             raise KeyError("The vertex is not in the graph")
 
-        return self.graph[vert_key].neighbors
+        return self._vertex_neighbors(self.graph[vert_key])
 
-    def get_edges(self) -> [tuple]:
+    def _vertex_predecessors(self, vert: Vertex) -> [Vertex]:
         """
-            Function for getting all of the edges from the graph
+            Function for getting the vertices with an edge recorded as going into
+            the vertex. The index behind it is built from the edge buffers on
+            first use and only built again after the graph changes.
+
+            Args:
+            * vert - The vertex object we're getting the predecessors of.
 
             Returns:
-            * A list of the unique edges within the graph.
+            * A list of vertex objects
         """
-        sorted_edges: set = set()
-        unique_edges: set = set()
+        if self.__predecessors_version != self.version:
+            # Counting sort of the edges by the vertex they go into
+            offsets = array("i", [0]) * (len(self.vertex_keys) + 1)
+            for to_id in self.edge_to:
+                offsets[to_id + 1] += 1
+            for vert_id in range(len(self.vertex_keys)):
+                offsets[vert_id + 1] += offsets[vert_id]
+
+            sources = array("i", [0]) * len(self.edge_from)
+            fill = array("i", offsets)
+            for from_id, to_id in zip(self.edge_from, self.edge_to):
+                sources[fill[to_id]] = from_id
+                fill[to_id] += 1
+
+            self.__predecessors = (offsets, sources)
+            self.__predecessors_version = self.version
+
+        offsets, sources = self.__predecessors
+        vert_id = self.vertex_ids[vert.key]
+        return [
+            self.graph[self.vertex_keys[from_id]]
+            for from_id in sources[offsets[vert_id]:offsets[vert_id + 1]]
+        ]
+
+    def iter_edges(self):
+        """
+            Generator for lazily walking the edges of the graph in the order that
+            they were added. Each undirected edge is yielded exactly once.
 
-        # Iterate through all of the edges within the graph
-        for vert_key, vert in self.graph.items():
+            Yields:
+            * A tuple of (edge id, from vertex key, to vertex key, weight)
+        """
+        keys = self.vertex_keys
+        edges = zip(self.edge_from, self.edge_to, self.edge_weights)
+        for edge_id, (from_id, to_id, weight) in enumerate(edges):
+            yield edge_id, keys[from_id], keys[to_id], weight
+
+    def get_edge(self, edge_id: int) -> tuple:
+        """
+            Function for getting an edge by the id it was given when it was added
+
+            Args:
+            * edge_id - The integer id of the edge
+
+            Returns:
+            * A tuple of (from vertex key, to vertex key, weight)
+        """
+        if not 0 <= edge_id < len(self.edge_from):
+            raise KeyError("The edge is not stored within this graph.")
 
-            # Iterate through all of the neighbors of the current vertex
-            for neighbor_vert, weight in vert.neighbors:
-                edge = [vert_key, neighbor_vert.key, str(weight)]
-                sorted_edge = tuple(sorted(edge))
+        return (
+            self.vertex_keys[self.edge_from[edge_id]],
+            self.vertex_keys[self.edge_to[edge_id]],
+            self.edge_weights[edge_id],
+        )
 
-                # Check if the sorted edge has been seen before.
-                if sorted_edge not in sorted_edges:
-                    unique_edges.add((vert_key, neighbor_vert.key, int(weight)))
+    def cache_info(self):
+        """
+            Function for getting the hit and miss statistics of the query cache
 
-                sorted_edges.add(sorted_edge)
+            Returns:
+            * A CacheInfo tuple of hits, misses, maxsize and currsize
+        """
+        return self.query_cache.info()
+
+    def get_edges(self) -> [tuple]:
+        """
+            Function for getting all of the edges from the graph
 
-        return list(unique_edges)
+            Returns:
+            * A list of the unique edges within the graph.
+        """
+        return [
+            (from_vert, to_vert, int(weight))
+            for _, from_vert, to_vert, weight in self.iter_edges()
+        ]
 
+    @cached_query
     def find_shortest_path(self, from_vertex: str, to_vertex: str) -> [str]:
         """
             Finding the shortest path from one vertex to another using breadth first
@@ -185,7 +302,7 @@ class Graph:
                 break
 
             # Iterate through all of the neighbors
-            for neighbor, _ in curr_vertex.neighbors:
+            for neighbor, _ in self._vertex_neighbors(curr_vertex):
 
                 # Add the neighbor to the queue if it hasn't been seen
                 if neighbor.key not in seen_nodes:
@@ -236,7 +353,7 @@ class Graph:
             return [curr_vert]
 
         # Iterate through the neighbors of the current vertex
-        for neighbor, _ in curr_vert.neighbors:
+        for neighbor, _ in self._vertex_neighbors(curr_vert):
             # Check if we haven't already seen it
             if neighbor.key not in seen_verts:
                 # Travel down the next path from the current vertex to the next
@@ -249,6 +366,7 @@ class Graph:
 
         return []
 
+    @cached_query
     def find_path(self, from_vert: str, to_vert: str):
         """
             Find a path between two vertices using DFS.
@@ -277,6 +395,7 @@ class Graph:
         seen_verts = set()
         pass
 
+    @cached_query
     def find_min_weight_path(self, from_vert: str, to_vert: str):
         """
             Find the minimum weighted path from a vertex to another using
@@ -317,7 +436,7 @@ class Graph:
             curr_vert_weight, _ = path[curr_vert.key]
 
             # Iterate through the neighbors of the current vertex
-            for neighbor, weight in curr_vert.neighbors:
+            for neighbor, weight in self._vertex_neighbors(curr_vert):
 
                 # Get the neighbors weight
                 prev_neighbor_weight, _ = path[neighbor.key]
@@ -355,7 +474,7 @@ class Graph:
             return False
 
         for vertex in self.graph.values():
-            neighbors = vertex.neighbors
+            neighbors = self._vertex_neighbors(vertex)
             if len(neighbors) % 2 != 0 or not neighbors:
                 return False
 
@@ -367,7 +486,7 @@ class Graph:
         visited.add(vertex)
 
         # Traverse for all its children
-        for neighbor, _ in vertex.neighbors:
+        for neighbor, _ in self._vertex_neighbors(vertex):
 
             # If not visited
             if not neighbor not in visited:
@@ -377,6 +496,7 @@ class Graph:
             memo[vertex] = max(memo[vertex], 1 + memo[neighbor])
 
     # Function that returns the longest path
+    @cached_query
     def find_longest_path(self):
 
         # Dp array
@@ -415,7 +535,7 @@ class Graph:
 
             visited.add(vert)
 
-            for neighbor, _ in vert.neighbors:
+            for neighbor, _ in self._vertex_neighbors(vert):
                 if neighbor in stack:
                     return False
 
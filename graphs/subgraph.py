@@ -0,0 +1,251 @@
+"""
+    Module that implements read-only subgraph views over an existing graph
+    (from graphs.graph or graphs.digraph)
+"""
+from collections import deque
+from collections.abc import Mapping
+
+from graphs.graph import Graph
+from graphs.utils.query_cache import QueryCache
+from graphs.vertex import Vertex
+
+
+class VertexMask(Mapping):
+    """
+        Dictionary-like view of the vertices of a graph restricted to a set
+        of selected keys. Lookups go straight to the parent's dictionary, so
+        no vertex objects are copied.
+    """
+
+    def __init__(self, parent_graph: Mapping, vert_keys: list, positions: dict):
+        self.parent_graph = parent_graph
+        self.vert_keys = vert_keys
+        # The position of every selected key in vert_keys
+        self.selected = positions
+
+    def position(self, vert_key: str) -> int:
+        """
+            Function for getting the position of a selected key in the view
+        """
+        return self.selected[vert_key]
+
+    def __getitem__(self, vert_key: str):
+        if vert_key not in self.selected:
+            raise KeyError(vert_key)
+
+        return self.parent_graph[vert_key]
+
+    def __contains__(self, vert_key):
+        return vert_key in self.selected
+
+    def __iter__(self):
+        return iter(self.vert_keys)
+
+    def __len__(self):
+        return len(self.vert_keys)
+
+
+class SubgraphView(Graph):
+    """
+        Class for representing the induced subgraph of a graph or digraph
+
+        Shares the vertex objects and adjacency lists of the parent graph,
+        and filters out every neighbor that is not part of the view, so all
+        of the Graph algorithms run unchanged on the selected vertices.
+    """
+
+    def __init__(self, parent: Graph, vert_keys):
+        # Views of views still dispatch to the original graph type
+        if isinstance(parent, SubgraphView):
+            self.graph_type = parent.graph_type
+        else:
+            self.graph_type = type(parent)
+
+        self.parent = parent
+        self.vertex_keys = []
+
+        # Keep the selected keys in order, dropping any duplicates
+        positions = {}
+        for vert_key in vert_keys:
+            if vert_key not in parent.graph:
+                raise KeyError(f"The vertex {vert_key} is not stored within the parent graph.")
+
+            if vert_key not in positions:
+                positions[vert_key] = len(self.vertex_keys)
+                self.vertex_keys.append(vert_key)
+
+        self.graph = VertexMask(parent.graph, self.vertex_keys, positions)
+        self.verticies = len(self.vertex_keys)
+        self.query_cache = QueryCache()
+        self.__edge_count = None
+        self.__edge_count_version = None
+
+    def __repr__(self):
+        return (
+            f"<Subgraph of {self.graph_type.__name__}> - "
+            f"{self.verticies} verts - {self.edges} edges"
+        )
+
+    @property
+    def edges(self):
+        """
+            The amount of edges between the selected vertices, counted on first
+            use and only counted again after the parent graph changes.
+        """
+        if self.__edge_count_version != self.version:
+            self.__edge_count = sum(1 for _ in self.iter_edges())
+            self.__edge_count_version = self.version
+
+        return self.__edge_count
+
+    @property
+    def is_directed(self) -> bool:
+        """
+            Whether the edges of the parent graph only go one way
+        """
+        return self.parent.is_directed
+
+    @property
+    def version(self):
+        """
+            The mutation version of the parent graph, since any edge added to
+            it between the selected vertices changes the view as well.
+        """
+        return self.parent.version
+
+    def add_vertex(self, vert: Vertex):
+        raise TypeError("Subgraph views are read-only, add the vertex to the parent graph.")
+
+    def add_edge(self, from_vert: str, to_vert: str, weight: float = 1.0):
+        raise TypeError("Subgraph views are read-only, add the edge to the parent graph.")
+
+    def _vertex_neighbors(self, vert: Vertex) -> [tuple]:
+        """
+            Function for getting the (neighbor, weight) pairs of a vertex,
+            restricted to the neighbors that are inside of this view.
+        """
+        return [
+            (neighbor, weight)
+            for neighbor, weight in vert.neighbors
+            if neighbor.key in self.graph
+        ]
+
+    def _vertex_predecessors(self, vert: Vertex) -> [Vertex]:
+        """
+            Function for getting the vertices with an edge into the vertex,
+            restricted to the ones that are inside of this view.
+        """
+        return [
+            predecessor
+            for predecessor in self.parent._vertex_predecessors(vert)
+            if predecessor.key in self.graph
+        ]
+
+    def iter_edges(self):
+        """
+            Generator for lazily walking the edges that have both of their
+            vertices inside of this view, visiting only the neighbors of the
+            selected vertices. Edge ids count the edges of the view in the
+            order of its vertices, so they're only stable while the parent
+            graph doesn't change.
+
+            Yields:
+            * A tuple of (edge id, from vertex key, to vertex key, weight)
+        """
+        edge_id = 0
+        for position, vert_key in enumerate(self.vertex_keys):
+            for neighbor, weight in self._vertex_neighbors(self.graph[vert_key]):
+                # Undirected edges are listed under both of their vertices, only
+                # yield them from the one that comes first in the view
+                if self.is_directed or self.graph.position(neighbor.key) > position:
+                    yield edge_id, vert_key, neighbor.key, weight
+                    edge_id += 1
+
+    def get_edge(self, edge_id: int) -> tuple:
+        """
+            Function for getting an edge of the view by its id in the view, by
+            walking the edges of the view up to it.
+        """
+        for curr_id, from_vert, to_vert, weight in self.iter_edges():
+            if curr_id == edge_id:
+                return from_vert, to_vert, weight
+
+        raise KeyError("The edge is not stored within this view.")
+
+
+def induced_subgraph(graph: Graph, vert_keys) -> SubgraphView:
+    """
+        Create a view of the graph that only contains the selected vertices
+        and the edges between them. Runs in O(selected vertices).
+
+        Args:
+        * graph - The graph (or subgraph view) to slice
+        * vert_keys - An iterable of the vertex keys to keep
+
+        Returns:
+        A SubgraphView sharing the vertices of the graph.
+    """
+    return SubgraphView(graph, vert_keys)
+
+
+def range_subgraph(graph: Graph, start: int, stop: int) -> SubgraphView:
+    """
+        Create a view of the graph from a range of vertex ids, where the id
+        of a vertex is the order that it was added to the graph in.
+
+        Args:
+        * graph - The graph (or subgraph view) to slice
+        * start - The id of the first vertex to keep
+        * stop - The id after the last vertex to keep
+
+        Returns:
+        A SubgraphView sharing the vertices of the graph.
+    """
+    return SubgraphView(graph, graph.vertex_keys[start:stop])
+
+
+def reachable_subgraph(graph: Graph, root: str, dependencies: bool = False) -> SubgraphView:
+    """
+        Create a view of every vertex that can be reached from the root vertex
+        using breadth first search.
+
+        In the npm graph edges point from a dependency to its dependant, so
+        following them gives every package that depends on the root. Pass
+        dependencies=True to follow the edges backwards instead, which gives
+        the dependency subtree of the root. Undirected graphs ignore it.
+
+        Args:
+        * graph - The graph (or subgraph view) to slice
+        * root - The key of the vertex to start the traversal from
+        * dependencies - (False) - Follow the edges into each vertex instead
+        of the edges out of it
+
+        Returns:
+        A SubgraphView sharing the vertices of the graph.
+    """
+    if root not in graph.graph:
+        raise KeyError("The vertex is not stored within this graph.")
+
+    backwards = dependencies and graph.is_directed
+
+    # Initialize the seen nodes and the queue with the root
+    reached_keys = [root]
+    seen_nodes = {root}
+    queue = deque([graph.graph[root]])
+
+    # Keep traversing while there are still items on the queue
+    while queue:
+        curr_vertex = queue.popleft()
+
+        if backwards:
+            neighbors = graph._vertex_predecessors(curr_vertex)
+        else:
+            neighbors = [neighbor for neighbor, _ in graph._vertex_neighbors(curr_vertex)]
+
+        for neighbor in neighbors:
+            if neighbor.key not in seen_nodes:
+                seen_nodes.add(neighbor.key)
+                reached_keys.append(neighbor.key)
+                queue.append(neighbor)
+
+    return SubgraphView(graph, reached_keys)
@@ -0,0 +1,109 @@
+"""
+    Bounded LRU cache for the results of graph queries
+"""
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class QueryCache:
+    """
+        Least recently used cache keyed by (method, args, graph version)
+
+        Properties:
+        * maxsize - The most results that are kept at once.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("The cache has to be able to hold at least one result.")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__version = None
+        self.__results: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self.__results)
+
+    def get(self, key: tuple, version: int, compute):
+        """
+            Function for getting a cached result, computing and storing it if
+            it isn't cached for the current version of the graph yet.
+
+            Args:
+            * key - A hashable (method name, args) tuple
+            * version - The current mutation version of the graph
+            * compute - A function with no args that runs the query
+
+            Returns:
+            * The result of the query
+        """
+        # Results from older versions can never be hit again, drop them
+        if version != self.__version:
+            self.__results.clear()
+            self.__version = version
+
+        if key in self.__results:
+            self.hits += 1
+            self.__results.move_to_end(key)
+            return self.__results[key]
+
+        self.misses += 1
+        result = compute()
+        self.__results[key] = result
+
+        # Evict the least recently used result once we're over capacity
+        if len(self.__results) > self.maxsize:
+            self.__results.popitem(last=False)
+
+        return result
+
+    def clear(self):
+        """
+            Function for dropping every result and resetting the statistics
+        """
+        self.__results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """
+            Function for getting the hit and miss statistics of the cache
+
+            Returns:
+            * A CacheInfo tuple of hits, misses, maxsize and currsize
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.__results))
+
+
+def _copy_result(result):
+    """
+        Copy the lists inside of a result so callers can't modify the cached one
+    """
+    if isinstance(result, list):
+        return list(result)
+
+    if isinstance(result, tuple):
+        return tuple(list(item) if isinstance(item, list) else item for item in result)
+
+    return result
+
+
+def cached_query(method):
+    """
+        Decorator for caching the result of a graph query method in the
+        graph's query_cache, keyed by the graph's mutation version.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        result = self.query_cache.get(
+            key, self.version, lambda: method(self, *args, **kwargs)
+        )
+        return _copy_result(result)
+
+    return wrapper
@@ -2,6 +2,8 @@ import argparse
 # Import the os module, for the os.walk function
 import os
 
+from graphs.analytics import pagerank, path_criticality, transitive_dependants
+from graphs.diameter import find_diameter
 from graphs.digraph import Digraph
 from graphs.graph import fill_graph
 from graphs.utils.file_reader import read_graph_file
@@ -73,10 +75,25 @@ def main(args: argparse.Namespace):
             dependency = key
 
     print(f"\tMost depended on package: {dependency} with {highest} dependants")
+
+    # Direct neighbors miss the packages that matter through other packages,
+    # big graphs get estimated counts instead of the exact bitset counts
+    package, dependants = transitive_dependants(graph, seed=0, top=1)[0]
+    print(
+        f"\tMost transitively depended on package: {package} with about {dependants} dependants"
+    )
+    package, rank = pagerank(graph, top=1)[0]
+    print(f"\tHighest PageRank package: {package} with a rank of {rank:.4f}")
+    package, share = path_criticality(graph, top=1)[0]
+    print(f"\tMost critical package: {package} in {share:.2%} of dependency chains")
     path_len, package = graph.find_longest_path()
     print(
         f"\tThe longest shortest path was: {path_len} edges and to the package: {package}"
     )
+    path, diameter = find_diameter(graph)
+    print(
+        f"\tThe undirected diameter is: {diameter} edges between {path[0]} and {path[-1]}"
+    )
     is_acyclic = graph.prove_acyclic(args.folder.strip("/").split("/")[-1])
     print(f"\tThe graph is acyclic: {is_acyclic}")
     print("\n#### END EVALUATION ####")